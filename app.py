@@ -1,21 +1,60 @@
 import dash
-from dash import dcc, html, Input, Output, dash_table, State
+from dash import dcc, html, Input, Output, dash_table, State, ClientsideFunction
 import dash_bootstrap_components as dbc
 import pandas as pd
-import requests
 import numpy as np
+import pyarrow as pa
+import os
+import tempfile
+import threading
+import time
+from cachetools import TTLCache, cached
+from http_client import decode_json, session
 
 # Initialize Dash app with a dark theme
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.CYBORG])
 
+API_URL = "https://yields.llama.fi/pools"
+CACHE_PATH = os.path.join(tempfile.gettempdir(), "pools.parquet")
+CACHE_TTL = 300  # seconds
+
+# Only the fields the dashboard uses; everything else in the payload is skipped
+POOL_SCHEMA = pa.schema([
+    ("symbol", pa.string()),
+    ("chain", pa.string()),
+    ("project", pa.string()),
+    ("tvlUsd", pa.float64()),
+    ("apy", pa.float64()),
+])
+
+# Persist via a temp file + rename so workers booting mid-write never read a partial
+# file; a failed write only costs the next cold start an API call
+def save_cache(df):
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(CACHE_PATH), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            df.to_parquet(f, index=False)
+        os.replace(tmp_path, CACHE_PATH)
+    except (OSError, ValueError, pa.ArrowException):
+        app.logger.exception("Could not write pool cache %s", CACHE_PATH)
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
 # Fetch real-time data from DeFi Llama API
+@cached(TTLCache(maxsize=1, ttl=CACHE_TTL))
 def fetch_data():
-    url = "https://yields.llama.fi/pools"
-    response = requests.get(url)
+    response = session.get(API_URL, timeout=5)
     if response.status_code == 200:
-        data = response.json()
-        df = pd.DataFrame(data["data"])
-        df = df[["symbol", "chain", "project", "tvlUsd", "apy"]]
+        data = decode_json(response)  # orjson on the raw bytes, no str round-trip
+        try:
+            df = pa.Table.from_pylist(data["data"], schema=POOL_SCHEMA).to_pandas()
+        except pa.ArrowException:
+            # A row with an off-type field (e.g. a numeric symbol or a string TVL) fails the
+            # strict schema; fall back to pandas' per-value inference rather than drop the fetch
+            df = pd.DataFrame(data["data"], columns=POOL_SCHEMA.names)
+            # Non-string symbols become missing, so token searches skip them as pandas' str.contains did
+            df["symbol"] = df["symbol"].where(df["symbol"].map(type).eq(str))
         df.rename(columns={
             "symbol": "Symbol",
             "chain": "Chain",
@@ -23,13 +62,22 @@ def fetch_data():
             "tvlUsd": "TVL (USD)",
             "apy": "APY (%)"
         }, inplace=True)
-        df["Vora Score"] = np.random.randint(50, 100, len(df))  # Placeholder for Vora Score
+        # Placeholder for Vora Score, hashed from the pool's identity so it is stable across fetches
+        pool_hash = pd.util.hash_pandas_object(df[["Symbol", "Chain", "Protocol"]], index=False).to_numpy()
+        df["Vora Score"] = (pool_hash % 50 + 50).astype(np.uint8)
+        save_cache(df)
         return df
     else:
         return pd.DataFrame()
 
-# Load and preprocess data
-df = fetch_data()
+# Load the last persisted response if it is still fresh, otherwise hit the API
+def load_data():
+    try:
+        if time.time() - os.path.getmtime(CACHE_PATH) < CACHE_TTL:
+            return pd.read_parquet(CACHE_PATH)
+    except (OSError, ValueError):
+        pass
+    return fetch_data()
 
 # Limit chains and protocols to specified options
 valid_chains = ["Arbitrum", "Avalanche", "Base", "BNB", "Ethereum", "Optimism", "Polygon", "Solana"]
@@ -38,9 +86,36 @@ valid_protocols = [
     "pancakeswap-amm", "pancakeswap-amm-v3", "pendle", "quickswap-dex", "sushiswap",
     "uniswap-v2", "uniswap-v3", "velodrome-v2", "yearn-finance", "yldr"
 ]
-df = df[df["Chain"].isin(valid_chains)]
-df = df[df["Protocol"].isin(valid_protocols)]
-df = df.sort_values(by="Vora Score", ascending=False)
+chain_options = [{"label": chain, "value": chain} for chain in valid_chains]
+protocol_options = [{"label": protocol, "value": protocol} for protocol in valid_protocols]
+chain_dtype = pd.CategoricalDtype(valid_chains)
+protocol_dtype = pd.CategoricalDtype(valid_protocols)
+
+# Casting to the fixed categories turns unsupported chains/protocols into NaN
+def prepare_data(df):
+    df = df.astype({"Chain": chain_dtype, "Protocol": protocol_dtype})
+    df = df.dropna(subset=["Chain", "Protocol"])
+    return df.sort_values(by="Vora Score", ascending=False).reset_index(drop=True)
+
+# Filtering runs in the browser (assets/filters.js) over this record list
+def publish_data(df):
+    app.server.config["records"] = df.to_dict("records")
+
+# Re-fetch every CACHE_TTL seconds and swap in the new data for future page loads
+def _refresh_loop():
+    while True:
+        time.sleep(CACHE_TTL)
+        # Any failure skips this cycle and keeps the current data; the thread must not die
+        try:
+            df = fetch_data()
+            if not df.empty:
+                publish_data(prepare_data(df))
+        except Exception:
+            app.logger.exception("Pool data refresh failed; keeping current data")
+
+# Load and preprocess data
+publish_data(prepare_data(load_data()))
+threading.Thread(target=_refresh_loop, daemon=True).start()
 
 # Navbar
 navbar = dbc.NavbarSimple(
@@ -50,122 +125,135 @@ navbar = dbc.NavbarSimple(
     dark=True,
 )
 
-# App layout
-app.layout = dbc.Container([
-    navbar,  # Navbar at the top
-
-    # Portfolio Analysis Section at the Top
-    dbc.Card([
-        dbc.CardHeader("Portfolio Analysis"),
-        dbc.CardBody([
-            html.Div(id="portfolio-stats", className="mb-3"),
-            html.Div(id="portfolio-table")
-        ]),
-    ], className="mb-4"),
-
-    # Filters Section
-    dbc.Card([
-        dbc.CardHeader("Filters"),
-        dbc.CardBody([
-            dbc.Row([
-                # Chain Filter
-                dbc.Col([
-                    html.Label("Chain", style={"font-size": "1em"}),
-                    dcc.Dropdown(
-                        id="chain-filter",
-                        options=[{"label": chain, "value": chain} for chain in valid_chains],
-                        multi=True,
-                        style={"color": "black"}
-                    )
-                ], width=2),
-
-                # Protocol Filter
-                dbc.Col([
-                    html.Label("Protocol", style={"font-size": "1em"}),
-                    dcc.Dropdown(
-                        id="protocol-filter",
-                        options=[{"label": protocol, "value": protocol} for protocol in valid_protocols],
-                        multi=True,
-                        style={"color": "black"}
-                    )
-                ], width=2),
-
-                # Token 1 Filter
-                dbc.Col([
-                    html.Label("Token 1", style={"font-size": "1em"}),
-                    dcc.Input(
-                        id="token1-filter",
-                        type="text",
-                        placeholder="Search Token 1",
-                        style={"color": "black"}
-                    )
-                ], width=2),
-
-                # Token 2 Filter
-                dbc.Col([
-                    html.Label("Token 2", style={"font-size": "1em"}),
-                    dcc.Input(
-                        id="token2-filter",
-                        type="text",
-                        placeholder="Search Token 2",
-                        style={"color": "black"}
-                    )
-                ], width=2),
-
-                # Min TVL Filter
-                dbc.Col([
-                    html.Label("Min TVL", style={"font-size": "1em"}),
-                    dcc.Input(
-                        id="tvl-filter",
-                        type="number",
-                        value=800000,
-                        style={"color": "black"}
-                    )
-                ], width=2),
-
-                # Min APY Filter
-                dbc.Col([
-                    html.Label("Min APY", style={"font-size": "1em"}),
-                    dcc.Input(
-                        id="apy-filter",
-                        type="number",
-                        value=5,
-                        style={"color": "black"}
-                    )
-                ], width=2),
-            ], className="mt-3"),
-        ]),
-    ], className="mb-4"),
-
-    # Results Table
-    dbc.Card([
-        dbc.CardHeader("Filtered Liquidity Pools"),
-        dbc.CardBody(dash_table.DataTable(
-            id="lp-table",
-            columns=[
-                {"name": "Symbol", "id": "Symbol"},
-                {"name": "Chain", "id": "Chain"},
-                {"name": "Protocol", "id": "Protocol"},
-                {"name": "TVL (USD)", "id": "TVL (USD)", "type": "numeric", "format": {"specifier": "$,.0f"}},
-                {"name": "APY (%)", "id": "APY (%)", "type": "numeric", "format": {"specifier": ".2f"}},
-                {"name": "Vora Score", "id": "Vora Score", "type": "numeric"},
-            ],
-            data=df.to_dict("records"),
-            row_selectable="multi",  # Enable row selection
-            selected_rows=[],  # Keep track of selected rows
-            style_table={"overflowX": "auto"},
-            style_header={"backgroundColor": "black", "color": "white", "fontWeight": "bold"},
-            style_cell={"backgroundColor": "#222", "color": "white"},
-            sort_action="native",
-            filter_action="native",
-        )),
-    ], className="mb-4"),
-], fluid=True)
+# App layout, rebuilt per page load so refreshed data reaches new sessions
+def serve_layout():
+    return dbc.Container([
+        navbar,  # Navbar at the top
+        dcc.Store(id="pools-store", data=app.server.config["records"]),
+
+        # Portfolio Analysis Section at the Top
+        dbc.Card([
+            dbc.CardHeader("Portfolio Analysis"),
+            dbc.CardBody([
+                html.Div(id="portfolio-stats", className="mb-3"),
+                html.Div(id="portfolio-table")
+            ]),
+        ], className="mb-4"),
+
+        # Filters Section
+        dbc.Card([
+            dbc.CardHeader("Filters"),
+            dbc.CardBody([
+                dbc.Row([
+                    # Chain Filter
+                    dbc.Col([
+                        html.Label("Chain", style={"font-size": "1em"}),
+                        dcc.Dropdown(
+                            id="chain-filter",
+                            options=chain_options,
+                            multi=True,
+                            style={"color": "black"}
+                        )
+                    ], width=2),
+
+                    # Protocol Filter
+                    dbc.Col([
+                        html.Label("Protocol", style={"font-size": "1em"}),
+                        dcc.Dropdown(
+                            id="protocol-filter",
+                            options=protocol_options,
+                            multi=True,
+                            style={"color": "black"}
+                        )
+                    ], width=2),
+
+                    # Token 1 Filter
+                    dbc.Col([
+                        html.Label("Token 1", style={"font-size": "1em"}),
+                        dcc.Input(
+                            id="token1-filter",
+                            type="text",
+                            placeholder="Search Token 1",
+                            debounce=True,
+                            style={"color": "black"}
+                        )
+                    ], width=2),
+
+                    # Token 2 Filter
+                    dbc.Col([
+                        html.Label("Token 2", style={"font-size": "1em"}),
+                        dcc.Input(
+                            id="token2-filter",
+                            type="text",
+                            placeholder="Search Token 2",
+                            debounce=True,
+                            style={"color": "black"}
+                        )
+                    ], width=2),
+
+                    # Min TVL Filter
+                    dbc.Col([
+                        html.Label("Min TVL", style={"font-size": "1em"}),
+                        dcc.Input(
+                            id="tvl-filter",
+                            type="number",
+                            value=800000,
+                            debounce=True,
+                            style={"color": "black"}
+                        )
+                    ], width=2),
+
+                    # Min APY Filter
+                    dbc.Col([
+                        html.Label("Min APY", style={"font-size": "1em"}),
+                        dcc.Input(
+                            id="apy-filter",
+                            type="number",
+                            value=5,
+                            debounce=True,
+                            style={"color": "black"}
+                        )
+                    ], width=2),
+                ], className="mt-3"),
+            ]),
+        ], className="mb-4"),
+
+        # Results Table
+        dbc.Card([
+            dbc.CardHeader("Filtered Liquidity Pools"),
+            dbc.CardBody(dash_table.DataTable(
+                id="lp-table",
+                columns=[
+                    {"name": "Symbol", "id": "Symbol"},
+                    {"name": "Chain", "id": "Chain"},
+                    {"name": "Protocol", "id": "Protocol"},
+                    {"name": "TVL (USD)", "id": "TVL (USD)", "type": "numeric", "format": {"specifier": "$,.0f"}},
+                    {"name": "APY (%)", "id": "APY (%)", "type": "numeric", "format": {"specifier": ".2f"}},
+                    {"name": "Vora Score", "id": "Vora Score", "type": "numeric"},
+                ],
+                data=[],  # Filled from pools-store by the clientside filter callback
+                row_selectable="multi",  # Enable row selection
+                selected_rows=[],  # Keep track of selected rows
+                style_table={"overflowX": "auto"},
+                style_header={"backgroundColor": "black", "color": "white", "fontWeight": "bold"},
+                style_cell={"backgroundColor": "#222", "color": "white"},
+                sort_action="native",
+                filter_action="native",
+                page_action="native",  # Render one page of rows at a time
+                page_size=25,
+            )),
+        ], className="mb-4"),
+    ], fluid=True)
+
+
+app.layout = serve_layout
 
 # Callbacks for filtering and portfolio selection
-@app.callback(
+app.clientside_callback(
+    ClientsideFunction(namespace="filters", function_name="apply"),
     Output("lp-table", "data"),
     [
+        Input("pools-store", "data"),
         Input("chain-filter", "value"),
         Input("protocol-filter", "value"),
         Input("token1-filter", "value"),
@@ -174,24 +262,6 @@ app.layout = dbc.Container([
         Input("apy-filter", "value"),
     ]
 )
-def update_results(chain_filter, protocol_filter, token1_filter, token2_filter, tvl_filter, apy_filter):
-    filtered_df = df.copy()
-
-    if chain_filter:
-        filtered_df = filtered_df[filtered_df["Chain"].isin(chain_filter)]
-    if protocol_filter:
-        filtered_df = filtered_df[filtered_df["Protocol"].isin(protocol_filter)]
-    if token1_filter:
-        filtered_df = filtered_df[filtered_df["Symbol"].str.contains(token1_filter, case=False, na=False)]
-    if token2_filter:
-        filtered_df = filtered_df[filtered_df["Symbol"].str.contains(token2_filter, case=False, na=False)]
-    if tvl_filter:
-        filtered_df = filtered_df[filtered_df["TVL (USD)"] >= tvl_filter]
-    if apy_filter:
-        filtered_df = filtered_df[filtered_df["APY (%)"] >= apy_filter]
-
-    return filtered_df.to_dict("records")
-
 
 if __name__ == "__main__":
     app.run_server(host="0.0.0.0", port=8080, debug=False)
\ No newline at end of file
@@ -0,0 +1,39 @@
+// Clientside filter for the liquidity pool table. Mirrors the semantics of the
+// former update_results callback: an empty filter is ignored, token searches are
+// case-insensitive substring matches, and pools without an APY fail an APY floor.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    filters: {
+        apply: function(records, chains, protocols, token1, token2, tvlMin, apyMin) {
+            if (!records) {
+                return [];
+            }
+            const chainSet = chains && chains.length ? new Set(chains) : null;
+            const protocolSet = protocols && protocols.length ? new Set(protocols) : null;
+            const tokens = [token1, token2].filter(Boolean).map(function(token) {
+                return token.toLowerCase();
+            });
+
+            return records.filter(function(row) {
+                if (chainSet && !chainSet.has(row["Chain"])) {
+                    return false;
+                }
+                if (protocolSet && !protocolSet.has(row["Protocol"])) {
+                    return false;
+                }
+                if (tokens.length) {
+                    const symbol = typeof row["Symbol"] === "string" ? row["Symbol"].toLowerCase() : "";
+                    if (!tokens.every(function(token) { return symbol.includes(token); })) {
+                        return false;
+                    }
+                }
+                if (tvlMin && !(row["TVL (USD)"] >= tvlMin)) {
+                    return false;
+                }
+                if (apyMin && !(row["APY (%)"] >= apyMin)) {
+                    return false;
+                }
+                return true;
+            });
+        }
+    }
+});
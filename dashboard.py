@@ -1,6 +1,6 @@
 import streamlit as st
 import pandas as pd
-import requests
+from http_client import session
 
 # Title for the dashboard
 st.title("CLP Evaluation Dashboard")
@@ -9,7 +9,7 @@ st.title("CLP Evaluation Dashboard")
 st.write("### Live Market Data")
 try:
     url = "https://api.coingecko.com/api/v3/simple/price?ids=ethereum&vs_currencies=usd"
-    response = requests.get(url).json()
+    response = session.get(url, timeout=10).json()
     eth_price = response["ethereum"]["usd"]
     st.write(f"**Live ETH Price:** ${eth_price}")
 except Exception as e:
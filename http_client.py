@@ -0,0 +1,70 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import orjson
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+MAX_RETRIES = 3
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+CACHE_TTL = 300  # seconds
+
+# Shared keep-alive session. Imported modules survive Streamlit reruns, so the
+# dashboards keep their pooled connections instead of re-handshaking each time.
+session = requests.Session()
+session.headers.update({"Accept": "application/json"})
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=10,
+    max_retries=Retry(
+        total=MAX_RETRIES,
+        backoff_factor=0.2,
+        status_forcelist=(429, 500, 502, 503, 504),
+        raise_on_status=False,
+    ),
+)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
+
+
+def decode_json(response):
+    """Decode a JSON body with orjson, raising requests' JSONDecodeError like response.json()."""
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+
+
+def cached_get(url, params=None, ttl=CACHE_TTL, timeout=10):
+    """GET a JSON endpoint through the shared session, cached on disk for `ttl` seconds."""
+    key = hashlib.md5((url + json.dumps(params, sort_keys=True)).encode()).hexdigest()
+    path = os.path.join(CACHE_DIR, f"{key}.json")
+    try:
+        with open(path, "rb") as f:
+            entry = orjson.loads(f.read())
+        if time.time() - entry["ts"] < ttl:
+            return entry["data"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    response = session.get(url, params=params, timeout=timeout)
+    response.raise_for_status()
+    data = decode_json(response)
+
+    # Write to a temp file first so concurrent readers never see a partial entry.
+    # The cache is best-effort: a failed write must not lose a successful fetch.
+    tmp_path = None
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(orjson.dumps({"ts": time.time(), "data": data}))
+        os.replace(tmp_path, path)
+    except OSError:
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return data
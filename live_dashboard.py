@@ -6,10 +6,11 @@ import pandas as pd
 import numpy as np
 from st_aggrid import AgGrid, GridOptionsBuilder
 from st_aggrid.shared import GridUpdateMode
+from http_client import cached_get
 
 # --- Constants ---
 API_URL = "https://yields.llama.fi/pools"
-MAX_RETRIES = 3
+API_COLUMNS = ["pool", "symbol", "chain", "project", "tvlUsd", "apy"]
 
 CHAIN_OPTIONS = ["ALL"] + ["Arbitrum", "Avalanche", "Base", "BNB", "Ethereum", "Optimism", "Polygon", "Solana"]
 PROJECT_OPTIONS = ["ALL"] + [
@@ -22,46 +23,50 @@ PROJECT_OPTIONS = ["ALL"] + [
 DEFAULT_TVL_MIN = 800_000
 DEFAULT_APY_MIN = 5.0
 ADJUSTED_APY_RANGE = (1, 20)
+GRID_COLUMNS = ["pool", "SYMBOL", "CHAIN", "PROJECT", "TVL (USD)", "APY (%)", "VORA_SCORE", "FAVORITE", "SELECTED"]
 
 # --- Fetch Data from API ---
 @st.cache_data
 def fetch_data():
-    """Fetches data from the DeFi Llama Yield Pools API."""
-    retries = 0
-    while retries < MAX_RETRIES:
-        try:
-            response = requests.get(API_URL, timeout=10)
-            response.raise_for_status()
-            return response.json()["data"]
-        except requests.exceptions.RequestException:
-            retries += 1
-    return []
+    """Fetches data from the DeFi Llama Yield Pools API (retried and disk-cached by http_client)."""
+    try:
+        return cached_get(API_URL)["data"]
+    except requests.exceptions.RequestException:
+        return []
 
 # --- Normalize Metrics ---
-def normalize(series):
-    """Normalize a Pandas series using Min-Max scaling."""
-    return (series - series.min()) / (series.max() - series.min())
+def normalize(values):
+    """Normalize a NumPy array using Min-Max scaling, ignoring NaNs like Series.min/max."""
+    low = np.nanmin(values)
+    return (values - low) / (np.nanmax(values) - low)
 
 # --- Calculate Vora LP Score ---
 def calculate_vora_score(df):
     """Calculates the proprietary Vora LP Score for each liquidity pool."""
-    df["NORMALIZED_TVL"] = normalize(df["TVL (USD)"])
-    df["NORMALIZED_APY"] = normalize(df["APY (%)"])
-    df["VORA_SCORE"] = (
-        25 * df["NORMALIZED_TVL"] +
-        20 * df["NORMALIZED_APY"] +
-        15 * np.random.uniform(0, 1, len(df)) +  # Fee Efficiency (placeholder)
-        10 * (1 - np.random.uniform(0, 1, len(df))) +  # Impermanent Loss (placeholder)
-        30 * np.random.uniform(0, 1, len(df))  # Token Quality (placeholder)
-    ).astype(int)  # Convert to integer
+    n = len(df)
+    rng = np.random.default_rng()
+    # Accumulate in place so the weighted sum allocates a single output array
+    score = normalize(df["TVL (USD)"].to_numpy())
+    score *= 25.0
+    score += 20.0 * normalize(df["APY (%)"].to_numpy())
+    score += 15.0 * rng.random(n)  # Fee Efficiency (placeholder)
+    score += 10.0 * (1.0 - rng.random(n))  # Impermanent Loss (placeholder)
+    score += 30.0 * rng.random(n)  # Token Quality (placeholder)
+    # Truncate to a nullable integer so pools missing TVL/APY get <NA> instead of a garbage int
+    df["VORA_SCORE"] = pd.Series(np.trunc(score), index=df.index).astype("Int32")
     return df
 
-# --- Format Columns ---
-def format_columns(df):
-    """Format TVL and APY columns for proper display."""
-    df["TVL (USD)"] = df["TVL (USD)"].apply(lambda x: f"${x:,.0f}")
-    df["APY (%)"] = df["APY (%)"].apply(lambda x: f"{x:.2f}%")
-    return df
+# --- Load Scored Pools ---
+@st.cache_data(show_spinner=False)
+def load_scored():
+    """Builds and scores the pool DataFrame once, so widget changes only re-run the filters."""
+    data = fetch_data()
+    if not data:
+        return pd.DataFrame()
+    df = pd.DataFrame(data, columns=API_COLUMNS)
+    df = df.rename(columns={"chain": "CHAIN", "project": "PROJECT", "symbol": "SYMBOL", "tvlUsd": "TVL (USD)", "apy": "APY (%)"})
+    df = df.astype({"TVL (USD)": float, "APY (%)": float})
+    return calculate_vora_score(df)
 
 # --- Main Dashboard ---
 def main():
@@ -70,30 +75,20 @@ def main():
 
     # Fetch data
     st.write("Fetching data...")
-    data = fetch_data()
-    if not data:
+    df = load_scored()
+    if df.empty:
         st.error("Failed to load data.")
         return
 
-    # Convert to DataFrame
-    df = pd.DataFrame(data)
-    df = df.rename(columns={"chain": "CHAIN", "project": "PROJECT", "symbol": "SYMBOL", "tvlUsd": "TVL (USD)", "apy": "APY (%)"})
-    df["TVL (USD)"] = df["TVL (USD)"].astype(float)
-    df["APY (%)"] = df["APY (%)"].astype(float)
-
     # Initialize session state
     if "favorites" not in st.session_state:
         st.session_state["favorites"] = pd.DataFrame(columns=df.columns)
     if "selected" not in st.session_state:
         st.session_state["selected"] = pd.DataFrame(columns=df.columns)
 
-    # Sync favorites and selected LPs
-    df["FAVORITE"] = df["SYMBOL"].isin(st.session_state["favorites"]["SYMBOL"])
-    df["SELECTED"] = df["SYMBOL"].isin(st.session_state["selected"]["SYMBOL"])
-
-    # Calculate Vora LP Score
-    df = calculate_vora_score(df)
-    df = format_columns(df)
+    # Sync favorites and selected LPs by pool id (symbols repeat across chains and protocols)
+    df["FAVORITE"] = df["pool"].isin(st.session_state["favorites"]["pool"])
+    df["SELECTED"] = df["pool"].isin(st.session_state["selected"]["pool"])
 
     # Sidebar Filters
     st.sidebar.header("Filters")
@@ -103,20 +98,23 @@ def main():
     apy_min = st.sidebar.number_input("Minimum APY (%)", value=DEFAULT_APY_MIN, step=1.0, format="%.1f")
     adjusted_apy = st.sidebar.slider("Adjust APY Calculation (%)", min_value=ADJUSTED_APY_RANGE[0], max_value=ADJUSTED_APY_RANGE[1], value=1)
 
-    # Apply Filters
-    filtered_df = df.copy()
+    # Apply Filters as one combined mask so the frame is sliced only once
+    mask = (df["TVL (USD)"].to_numpy() >= tvl_min) & (df["APY (%)"].to_numpy() >= apy_min)
     if "ALL" not in selected_chains:
-        filtered_df = filtered_df[filtered_df["CHAIN"].isin(selected_chains)]
+        mask &= df["CHAIN"].isin(selected_chains).to_numpy()
     if "ALL" not in selected_projects:
-        filtered_df = filtered_df[filtered_df["PROJECT"].isin(selected_projects)]
-    filtered_df = filtered_df[filtered_df["TVL (USD)"].str.replace(",", "").str.replace("$", "").astype(float) >= tvl_min]
-    filtered_df = filtered_df[filtered_df["APY (%)"].str.replace("%", "").astype(float) >= apy_min]
+        mask &= df["PROJECT"].isin(selected_projects).to_numpy()
+    filtered_df = df.loc[mask, GRID_COLUMNS]
 
     # Interactive Table
     st.subheader("Filtered Liquidity Pools")
     grid_options = GridOptionsBuilder.from_dataframe(filtered_df)
     grid_options.configure_selection("multiple", use_checkbox=True, rowMultiSelectWithClick=True)
     grid_options.configure_column("FAVORITE", editable=True)
+    grid_options.configure_column("pool", hide=True)
+    # Columns stay numeric for filtering; formatting happens in the grid only
+    grid_options.configure_column("TVL (USD)", type=["numericColumn"], valueFormatter="x.toLocaleString('en-US', {style: 'currency', currency: 'USD', maximumFractionDigits: 0})")
+    grid_options.configure_column("APY (%)", type=["numericColumn"], valueFormatter="(x === null || x === undefined) ? '' : x.toFixed(2) + '%'")
     grid_options = grid_options.build()
 
     grid_response = AgGrid(
@@ -139,11 +137,12 @@ def main():
     st.subheader("Selected Liquidity Pools")
     selected_df = st.session_state["selected"]
     if not selected_df.empty:
-        selected_df["TVL (USD)"] = selected_df["TVL (USD)"].str.replace(",", "").str.replace("$", "").astype(float)
-        selected_df["APY (%)"] = selected_df["APY (%)"].str.replace("%", "").astype(float)
-        avg_tvl = selected_df["TVL (USD)"].mean()
-        avg_apy = selected_df["APY (%)"].mean()
-        avg_vora_score = selected_df["VORA_SCORE"].mean()
+        tvls = selected_df["TVL (USD)"].tolist()
+        apys = selected_df["APY (%)"].tolist()
+        scores = selected_df["VORA_SCORE"].tolist()
+        avg_tvl = sum(tvls) / len(tvls)
+        avg_apy = sum(apys) / len(apys)
+        avg_vora_score = sum(scores) / len(scores)
         st.write(f"**Average TVL:** ${avg_tvl:,.0f}")
         st.write(f"**Average APY:** {avg_apy:.2f}%")
         st.write(f"**Average Vora Score:** {avg_vora_score:.0f}")
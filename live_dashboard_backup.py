@@ -1,17 +1,17 @@
-import requests
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import streamlit as st
 from st_aggrid import AgGrid, GridOptionsBuilder
-from sklearn.preprocessing import MinMaxScaler
+from http_client import cached_get
 
 # Fetch LP data from DeFi Llama API
 @st.cache_data
 def fetch_lp_data():
     try:
         url = "https://yields.llama.fi/pools"
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()["data"]
+        data = cached_get(url)["data"]
         return pd.DataFrame(data)
     except Exception as e:
         st.error(f"Error fetching data: {e}")
@@ -66,24 +66,30 @@ if not lp_data.empty:
     coin_1 = st.sidebar.text_input("Search for Coin 1 (e.g., USDC)")
     coin_2 = st.sidebar.text_input("Search for Coin 2 (optional, e.g., WETH)")
 
-    # Apply filters
+    # Apply filters as one combined mask so the frame is sliced only once
+    mask = np.ones(len(lp_data), dtype=bool)
+
     if "All" not in selected_projects:
-        lp_data = lp_data[lp_data["project"].isin(selected_projects)]
+        mask &= lp_data["project"].isin(selected_projects).to_numpy()
 
     if "All" not in selected_networks:
-        lp_data = lp_data[lp_data["chain"].isin(selected_networks)]
+        mask &= lp_data["chain"].isin(selected_networks).to_numpy()
 
     if min_tvl.isdigit():
-        lp_data = lp_data[lp_data["tvlUsd"] >= int(min_tvl)]
+        mask &= lp_data["tvlUsd"].to_numpy() >= int(min_tvl)
 
     if min_apy.replace(".", "", 1).isdigit():
-        lp_data = lp_data[lp_data["apy"].fillna(0) >= float(min_apy)]
+        mask &= lp_data["apy"].fillna(0).to_numpy() >= float(min_apy)
 
-    if coin_1:
-        lp_data = lp_data[lp_data["symbol"].str.contains(coin_1.upper(), na=False)]
+    if coin_1 or coin_2:
+        # Non-string symbols become nulls, so they never match a coin, as str.contains(na=False) did
+        symbols = pa.array(lp_data["symbol"].where(lp_data["symbol"].map(type).eq(str)), type=pa.string())
+        for coin in (coin_1, coin_2):
+            if coin:
+                matches = pc.fill_null(pc.match_substring(symbols, coin.upper()), False)
+                mask &= matches.to_numpy(zero_copy_only=False)
 
-    if coin_2:
-        lp_data = lp_data[lp_data["symbol"].str.contains(coin_2.upper(), na=False)]
+    lp_data = lp_data[mask]
 
     # Keep raw values for display
     lp_data["Raw TVL"] = lp_data["tvlUsd"]
@@ -92,11 +98,14 @@ if not lp_data.empty:
     # Convert ilRisk to numeric
     lp_data["ilRisk"] = pd.to_numeric(lp_data["ilRisk"], errors="coerce").fillna(0)
 
-    # Normalize metrics for scoring
-    scaler = MinMaxScaler()
-    lp_data[["tvlUsd", "apy", "volumeUsd1d", "ilRisk"]] = scaler.fit_transform(
-        lp_data[["tvlUsd", "apy", "volumeUsd1d", "ilRisk"]]
-    )
+    # Normalize metrics for scoring (min-max scaling, NaNs ignored like MinMaxScaler)
+    metrics = lp_data[["tvlUsd", "apy", "volumeUsd1d", "ilRisk"]].to_numpy(dtype=np.float64)
+    metrics_min = np.nanmin(metrics, axis=0)
+    metrics_range = np.nanmax(metrics, axis=0) - metrics_min
+    metrics_range[metrics_range == 0] = 1.0
+    metrics -= metrics_min
+    metrics /= metrics_range
+    lp_data[["tvlUsd", "apy", "volumeUsd1d", "ilRisk"]] = metrics
 
     # Define weights for scoring
     weights = {
@@ -106,13 +115,10 @@ if not lp_data.empty:
         "ilRisk": 0.1        # 10% weight to Risk (negative influence)
     }
 
-    # Calculate Vora Fund Score
-    lp_data["Vora Score"] = (
-        weights["tvlUsd"] * lp_data["tvlUsd"] +
-        weights["apy"] * lp_data["apy"] +
-        weights["volumeUsd1d"] * lp_data["volumeUsd1d"] -
-        weights["ilRisk"] * lp_data["ilRisk"]
-    )
+    # Calculate Vora Fund Score in one pass over the normalized metrics (risk counts against)
+    lp_data["Vora Score"] = metrics @ np.array([
+        weights["tvlUsd"], weights["apy"], weights["volumeUsd1d"], -weights["ilRisk"]
+    ])
 
     # Sort by Vora Score
     lp_data = lp_data.sort_values(by="Vora Score", ascending=False)